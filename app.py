@@ -1,19 +1,29 @@
 """
-Flask application for AI-Powered Resume Screener
+Quart application for AI-Powered Resume Screener
 Main entry point for the web application.
 """
 
 import os
+import asyncio
+import hashlib
+import json
 import logging
+import threading
+import uuid
 from pathlib import Path
 from datetime import datetime
+from typing import List, Optional, Tuple, Union
 from werkzeug.utils import secure_filename
 
-from flask import Flask, render_template, request, jsonify
-from screener.parsing import extract_text_from_file, clean_text, extract_contact_info
-from screener.nlp import SkillExtractor, preprocess_text
-from screener.scoring import ResumeMatcher
-from screener.db import init_db, save_screening_result, get_screening_history, get_screening_by_id, save_candidate
+from quart import Quart, render_template, request, jsonify
+from screener.parsing import extract_text_from_file, normalize_text, extract_contact_info
+from screener.nlp import SkillExtractor
+from screener.scoring import JDContext, ResumeMatcher
+from screener.db import (
+    init_db, save_screening_and_candidate, save_screenings_bulk,
+    get_screening_history, get_screening_by_id, get_cached_screening, save_cached_screening,
+    get_corpus_texts
+)
 
 # Configure logging
 logging.basicConfig(
@@ -26,12 +36,19 @@ logger = logging.getLogger(__name__)
 FLASK_ENV = os.getenv('FLASK_ENV', 'development')
 IS_PRODUCTION = FLASK_ENV == 'production'
 
-# Flask app configuration
-app = Flask(__name__)
+# Quart app configuration (Flask-compatible API, async request handling)
+app = Quart(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
 app.config['UPLOAD_FOLDER'] = Path(__file__).parent / 'uploads'
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'docx', 'txt'}
 
+# Uploads are streamed to disk (and hashed) in 1MB chunks
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Resume/JD text is truncated to this length as soon as it is no longer
+# needed in full, before it is cached, passed around and stored
+MAX_STORED_TEXT_CHARS = 5000
+
 # Secret key for session management (use environment variable in production)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
@@ -45,9 +62,162 @@ data_dir.mkdir(exist_ok=True)
 # Initialize database
 init_db()
 
-# Initialize components
-skill_extractor = SkillExtractor()
-matcher = ResumeMatcher()
+# TF-IDF weights are fitted once on past screenings when enough exist
+TFIDF_MIN_CORPUS_DOCS = 20
+
+# The fitted matcher is saved here and loaded on start-up instead of refitting;
+# delete the file to refit on the current screenings
+MATCHER_PATH = Path(os.getenv('MATCHER_PATH', str(Path(__file__).parent / 'data' / 'matcher.joblib')))
+
+# Components are built on first use so worker start-up stays fast.
+# Screenings call the getters from several threads at once, so building
+# goes through one re-entrant lock (the getters call each other) and each
+# component is only published once it is complete.
+_skill_extractor = None
+_matcher = None
+_scoring_fingerprint = None
+_components_lock = threading.RLock()
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Return the shared skill extractor, loading the taxonomy on first use."""
+    global _skill_extractor
+    with _components_lock:
+        if _skill_extractor is None:
+            _skill_extractor = SkillExtractor()
+        return _skill_extractor
+
+
+def get_matcher() -> ResumeMatcher:
+    """
+    Return the shared resume matcher, creating it on first use.
+    A matcher saved at MATCHER_PATH is loaded with its IDF weights and the
+    current taxonomy's skill index. Otherwise its IDF weights are fitted on
+    stored screenings (and saved) if there are enough of them; without
+    them plain hashed term frequencies are compared.
+    """
+    global _matcher
+    with _components_lock:
+        if _matcher is not None:
+            return _matcher
+        
+        matcher = None
+        if MATCHER_PATH.exists():
+            try:
+                matcher = ResumeMatcher.load(str(MATCHER_PATH),
+                                             skill_index=get_skill_extractor().skill_index)
+            except Exception as e:
+                logger.warning(f"Could not load matcher from {MATCHER_PATH}: {e}")
+        if matcher is None:
+            matcher = ResumeMatcher(skill_index=get_skill_extractor().skill_index)
+            corpus = [normalize_text(text) for text in get_corpus_texts()]
+            if len(corpus) >= TFIDF_MIN_CORPUS_DOCS:
+                matcher.fit_corpus(corpus)
+                try:
+                    matcher.save(str(MATCHER_PATH))
+                except OSError as e:
+                    logger.warning(f"Could not save matcher to {MATCHER_PATH}: {e}")
+        
+        # Published only once fitted, so no thread scores (or caches rows)
+        # with a half-built matcher
+        _matcher = matcher
+        return _matcher
+
+
+def get_scoring_fingerprint() -> bytes:
+    """
+    Digest of the scoring state: matcher weights and skill taxonomy.
+    It is part of every screening cache key, so results cached before the
+    IDF weights were fitted or the taxonomy changed are not served again.
+    """
+    global _scoring_fingerprint
+    with _components_lock:
+        if _scoring_fingerprint is None:
+            digest = hashlib.blake2b(get_matcher().fingerprint(), digest_size=16)
+            digest.update(json.dumps(get_skill_extractor().skills_taxonomy, sort_keys=True).encode('utf-8'))
+            _scoring_fingerprint = digest.digest()
+        return _scoring_fingerprint
+
+
+def run_screening(resume_path: str, jd_text: str) -> dict:
+    """
+    Run the extraction, preprocessing and scoring pipeline for one resume.
+    Executed in a worker thread, off the event loop.
+    
+    Args:
+        resume_path: Path to the saved resume file
+        jd_text: Job description text
+        
+    Returns:
+        Dict with the scoring 'result' and the extracted 'resume_text',
+        truncated to MAX_STORED_TEXT_CHARS
+        
+    Raises:
+        ValueError: If no text can be extracted from the resume
+    """
+    payload = run_screening_batch([resume_path], jd_text)[0]
+    if isinstance(payload, Exception):
+        raise payload
+    return payload
+
+
+def run_screening_batch(resume_paths: List[str], jd_text: str) -> List[Union[dict, Exception]]:
+    """
+    Run the pipeline for several resumes against one job description.
+    The JD is preprocessed, skill-extracted and vectorized once into a
+    JDContext and all resumes are scored against it in one batch.
+    
+    Args:
+        resume_paths: Paths to the saved resume files
+        jd_text: Job description text
+        
+    Returns:
+        One run_screening payload per resume, in input order. A resume
+        that fails (e.g. an empty or unreadable file) gets the exception
+        in its place, so it does not fail the rest of the batch.
+    """
+    skill_extractor = get_skill_extractor()
+    matcher = get_matcher()
+    
+    # JD-side work happens once per batch
+    jd_processed = normalize_text(jd_text)
+    jd_skills = skill_extractor.extract_skills(jd_processed)
+    jd_ctx = JDContext(jd_processed, jd_skills, matcher)
+    
+    payloads = []
+    extracted = []
+    for resume_path in resume_paths:
+        try:
+            # Extract resume (full text is only needed inside this loop)
+            resume_text_full = extract_text_from_file(resume_path)
+            
+            # Clean and preprocess text and extract skills
+            resume_processed = normalize_text(resume_text_full)
+            resume_skills = skill_extractor.extract_skills(resume_processed)
+        except Exception as e:
+            payloads.append(e)
+            continue
+        
+        # Attach candidate info and extracted skills; scores are added below
+        result = {
+            'candidate_info': extract_contact_info(resume_text_full),
+            'resume_skills': resume_skills,
+            'jd_skills': jd_skills
+        }
+        payload = {'result': result, 'resume_text': resume_text_full[:MAX_STORED_TEXT_CHARS]}
+        payloads.append(payload)
+        extracted.append((payload, resume_processed))
+    
+    # Score every extracted resume in one batch
+    scores = matcher.score_many_against(
+        [resume_processed for _, resume_processed in extracted],
+        [payload['result']['resume_skills'] for payload, _ in extracted],
+        jd_ctx
+    )
+    for (payload, _), score in zip(extracted, scores):
+        payload['result'] = {**score, **payload['result']}
+    
+    return payloads
 
 
 def allowed_file(filename: str) -> bool:
@@ -55,8 +225,11 @@ def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
 
-def save_uploaded_file(file) -> str:
-    """Save uploaded file and return path."""
+def save_uploaded_file(file) -> Tuple[str, bytes]:
+    """
+    Save uploaded file and return its path and content digest.
+    The digest is computed while streaming to disk so the bytes are read once.
+    """
     if not file or file.filename == '':
         raise ValueError("No file selected")
     
@@ -64,89 +237,111 @@ def save_uploaded_file(file) -> str:
         raise ValueError(f"File type not allowed. Allowed: {', '.join(app.config['ALLOWED_EXTENSIONS'])}")
     
     filename = secure_filename(file.filename)
-    # Add timestamp to avoid conflicts
-    filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
+    # Add timestamp and a random token: uploads with the same name may be
+    # saved concurrently (e.g. by /api/bulk_screen) within the same second
+    filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:12]}_{filename}"
     filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(filepath)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'wb') as out:
+        while chunk := file.stream.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            out.write(chunk)
     
     logger.info(f"File saved: {filepath}")
-    return filepath
+    return filepath, digest.digest()
+
+
+async def prepare_upload(resume_file, jd_text: str) -> Tuple[str, bytes, Optional[dict]]:
+    """
+    Save an uploaded resume and look it up in the screening cache.
+    
+    Args:
+        resume_file: Uploaded resume file
+        jd_text: Job description text
+        
+    Returns:
+        Tuple of (saved resume path, cache key, cached payload or None)
+    """
+    # Save resume (also validates the upload and hashes its bytes)
+    resume_path, resume_digest = await asyncio.to_thread(save_uploaded_file, resume_file)
+    
+    # Fingerprint inputs and scoring state so identical resume/JD pairs
+    # skip the pipeline as long as they would score the same
+    jd_digest = hashlib.blake2b(jd_text.encode('utf-8'), digest_size=16).digest()
+    scoring_digest = await asyncio.to_thread(get_scoring_fingerprint)
+    cache_key = resume_digest + jd_digest + scoring_digest
+    
+    payload = await asyncio.to_thread(get_cached_screening, cache_key)
+    if payload:
+        logger.info(f"Screening cache hit for {resume_file.filename}")
+    return resume_path, cache_key, payload
+
+
+async def screen_upload(resume_file, jd_text: str) -> dict:
+    """
+    Save an uploaded resume and screen it against a job description.
+    Identical resume/JD pairs are served from the screening cache.
+    
+    Args:
+        resume_file: Uploaded resume file
+        jd_text: Job description text
+        
+    Returns:
+        Screening payload from run_screening
+    """
+    resume_path, cache_key, payload = await prepare_upload(resume_file, jd_text)
+    if not payload:
+        payload = await asyncio.to_thread(run_screening, resume_path, jd_text)
+        await asyncio.to_thread(save_cached_screening, cache_key, payload)
+    
+    return payload
 
 
 @app.route('/')
-def index():
+async def index():
     """Home page - upload resume and JD."""
-    return render_template('index.html')
+    return await render_template('index.html')
 
 
 @app.route('/api/screen', methods=['POST'])
-def screen_resume():
+async def screen_resume():
     """
     API endpoint to screen a resume against a job description.
     Expects multipart form with 'resume' and 'jd_text' fields.
+    The CPU-bound pipeline and blocking I/O run in worker threads, so the
+    event loop stays free to serve other requests.
     """
     try:
+        files = await request.files
+        form = await request.form
+        
         # Check for resume file
-        if 'resume' not in request.files:
+        if 'resume' not in files:
             return jsonify({'error': 'No resume file provided'}), 400
         
-        resume_file = request.files['resume']
-        jd_text = request.form.get('jd_text', '').strip()
+        resume_file = files['resume']
+        jd_text = form.get('jd_text', '').strip()
         
         if not jd_text:
             return jsonify({'error': 'No job description provided'}), 400
         
-        # Save and extract resume
-        resume_path = save_uploaded_file(resume_file)
-        resume_text = extract_text_from_file(resume_path)
-        
-        # Clean texts
-        resume_clean = clean_text(resume_text)
-        jd_clean = clean_text(jd_text)
+        payload = await screen_upload(resume_file, jd_text)
+        result = payload['result']
+        resume_text = payload['resume_text']
         
-        # Preprocess for NLP
-        resume_processed = preprocess_text(resume_clean)
-        jd_processed = preprocess_text(jd_clean)
-        
-        # Extract skills
-        resume_skills = skill_extractor.extract_skills(resume_processed)
-        jd_skills = skill_extractor.extract_skills(jd_processed)
-        
-        # Score resume
-        result = matcher.score_resume(
-            resume_processed, 
-            jd_processed, 
-            resume_skills, 
-            jd_skills
-        )
-        
-        # Extract candidate info
-        candidate_info = extract_contact_info(resume_text)
-        
-        # Save to database
-        screening_id = save_screening_result(
+        # Save screening (and candidate, if we have a name) in one transaction
+        screening_id = await asyncio.to_thread(
+            save_screening_and_candidate,
             result,
             resume_file.filename,
             'uploaded_jd.txt',
             resume_text,
-            jd_text
+            jd_text[:MAX_STORED_TEXT_CHARS],
+            result['candidate_info']
         )
         
-        # Save candidate if we have a name
-        if candidate_info.get('name'):
-            save_candidate(
-                candidate_info['name'],
-                candidate_info.get('email', ''),
-                candidate_info.get('phone', ''),
-                resume_text,
-                resume_file.filename
-            )
-        
-        # Return result with candidate info
+        # Return result with screening ID
         result['screening_id'] = screening_id
-        result['candidate_info'] = candidate_info
-        result['resume_skills'] = resume_skills
-        result['jd_skills'] = jd_skills
         
         return jsonify(result), 200
     
@@ -155,24 +350,109 @@ def screen_resume():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/bulk_screen', methods=['POST'])
+async def bulk_screen():
+    """
+    API endpoint to screen several resumes against one job description.
+    Expects multipart form with one or more 'resumes' files and 'jd_text'.
+    Returns the results ranked by final score, followed by an error entry
+    for each resume that could not be screened. If none could be, returns
+    400 (or 500 if any failure was not a validation error).
+    """
+    try:
+        files = await request.files
+        form = await request.form
+        
+        resume_files = files.getlist('resumes')
+        jd_text = form.get('jd_text', '').strip()
+        
+        if not resume_files:
+            return jsonify({'error': 'No resume files provided'}), 400
+        
+        if not jd_text:
+            return jsonify({'error': 'No job description provided'}), 400
+        
+        # Save all uploads and look them up in the cache concurrently; a
+        # rejected upload only fails its own entry
+        prepared = await asyncio.gather(
+            *(prepare_upload(resume_file, jd_text) for resume_file in resume_files),
+            return_exceptions=True
+        )
+        errors = {i: item for i, item in enumerate(prepared) if isinstance(item, Exception)}
+        payloads = [None if i in errors else item[2] for i, item in enumerate(prepared)]
+        misses = [i for i, payload in enumerate(payloads) if i not in errors and not payload]
+        
+        if misses:
+            # Screen the misses in one batch, so the JD is processed once
+            # instead of once per resume
+            screened = await asyncio.to_thread(
+                run_screening_batch, [prepared[i][0] for i in misses], jd_text
+            )
+            
+            for i, payload in zip(misses, screened):
+                if isinstance(payload, Exception):
+                    errors[i] = payload
+                    # Nothing refers to an upload that could not be screened
+                    await asyncio.to_thread(Path(prepared[i][0]).unlink, missing_ok=True)
+                    continue
+                payloads[i] = payload
+                await asyncio.to_thread(save_cached_screening, prepared[i][1], payload)
+        
+        error_entries = []
+        for i, e in sorted(errors.items()):
+            logger.warning(f"Could not screen {resume_files[i].filename}: {e}")
+            error_entries.append({'resume_filename': resume_files[i].filename, 'error': str(e)})
+        
+        screened_ids = [i for i in range(len(resume_files)) if i not in errors]
+        if not screened_ids:
+            status = 400 if all(isinstance(e, ValueError) for e in errors.values()) else 500
+            return jsonify({'error': 'No resumes could be screened', 'files': error_entries}), status
+        
+        jd_text_store = jd_text[:MAX_STORED_TEXT_CHARS]
+        results = [payloads[i]['result'] for i in screened_ids]
+        
+        # Save all screenings (and their candidates) in one transaction
+        screening_ids = await asyncio.to_thread(save_screenings_bulk, [
+            (
+                payloads[i]['result'],
+                resume_files[i].filename,
+                'uploaded_jd.txt',
+                payloads[i]['resume_text'],
+                jd_text_store,
+                payloads[i]['result']['candidate_info']
+            )
+            for i in screened_ids
+        ])
+        for i, result, screening_id in zip(screened_ids, results, screening_ids):
+            result['screening_id'] = screening_id
+            result['resume_filename'] = resume_files[i].filename
+        
+        results.sort(key=lambda r: r['final_score'], reverse=True)
+        return jsonify(results + error_entries), 200
+    
+    except Exception as e:
+        logger.error(f"Error bulk screening resumes: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/results')
-def results():
+async def results():
     """Results page."""
-    return render_template('results.html')
+    return await render_template('results.html')
 
 
 @app.route('/history')
-def history():
+async def history():
     """History page - view past screenings."""
-    return render_template('history.html')
+    return await render_template('history.html')
 
 
 @app.route('/api/history', methods=['GET'])
-def get_history():
+async def get_history():
     """API endpoint to get screening history."""
     try:
         limit = request.args.get('limit', 50, type=int)
-        history_data = get_screening_history(limit)
+        history_data = await asyncio.to_thread(get_screening_history, limit)
         return jsonify(history_data), 200
     except Exception as e:
         logger.error(f"Error retrieving history: {e}")
@@ -180,10 +460,15 @@ def get_history():
 
 
 @app.route('/api/screening/<int:screening_id>', methods=['GET'])
-def get_screening(screening_id):
-    """API endpoint to get a specific screening by ID."""
+async def get_screening(screening_id):
+    """
+    API endpoint to get a specific screening by ID.
+    Pass ?include_text=0 to leave out the stored resume and JD text.
+    """
     try:
-        screening = get_screening_by_id(screening_id)
+        include_text = bool(request.args.get('include_text', 1, type=int))
+        screening = await asyncio.to_thread(get_screening_by_id, screening_id,
+                                            include_text=include_text)
         if not screening:
             return jsonify({'error': 'Screening not found'}), 404
         return jsonify(screening), 200
@@ -193,26 +478,26 @@ def get_screening(screening_id):
 
 
 @app.route('/api/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint."""
     return jsonify({'status': 'ok'}), 200
 
 
 @app.errorhandler(413)
-def request_entity_too_large(error):
+async def request_entity_too_large(error):
     """Handle file too large error."""
     return jsonify({'error': 'File size exceeds 50MB limit'}), 413
 
 
 @app.errorhandler(500)
-def internal_error(error):
+async def internal_error(error):
     """Handle internal errors."""
     logger.error(f"Internal server error: {error}")
     return jsonify({'error': 'Internal server error'}), 500
 
 
 if __name__ == '__main__':
-    # Run in debug mode locally (production uses gunicorn)
+    # Run in debug mode locally (production uses hypercorn)
     port = int(os.getenv('PORT', 5000))
     debug = not IS_PRODUCTION
     app.run(debug=debug, host='0.0.0.0', port=port)
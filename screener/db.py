@@ -7,8 +7,9 @@ import os
 import sqlite3
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,56 +17,174 @@ logger = logging.getLogger(__name__)
 default_db_path = Path(__file__).parent.parent / "data" / "screener.db"
 DB_PATH = Path(os.getenv('DATABASE_PATH', str(default_db_path)))
 
+# The screening cache is pruned on every insert to at most this many
+# entries, none older than this many days. Entries keyed on an old scoring
+# state are never hit again, so they only age out this way.
+SCREEN_CACHE_MAX_ROWS = 1000
+SCREEN_CACHE_MAX_AGE_DAYS = 30
 
-def init_db(db_path: str = None) -> None:
+# One long-lived connection per database file, shared across threads.
+# SQLite connections are not safe for concurrent use, so every access
+# goes through _lock.
+_connections: Dict[str, sqlite3.Connection] = {}
+_lock = threading.Lock()
+
+# Screening columns returned by list and detail views; the large text
+# columns are only read by the detail view
+_SCREENING_SUMMARY_COLUMNS = (
+    "id, created_at, resume_filename, jd_filename, final_score, "
+    "similarity_score, skill_match_score, rating"
+)
+_SCREENING_DETAIL_COLUMNS = _SCREENING_SUMMARY_COLUMNS + ", feedback, skill_details"
+
+# Row writers shared by the single and bulk save functions
+_INSERT_SCREENING_SQL = """
+    INSERT INTO screenings 
+    (resume_filename, jd_filename, final_score, similarity_score, 
+     skill_match_score, rating, feedback, skill_details, resume_text, jd_text)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_CANDIDATE_SQL = """
+    INSERT INTO candidates 
+    (name, email, phone, resume_text, resume_filename)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _get_connection(db_path: str = None) -> sqlite3.Connection:
     """
-    Initialize the database schema.
+    Return the shared connection for a database, opening it on first use.
+    Callers must hold _lock.
     
     Args:
         db_path: Path to database file
+        
+    Returns:
+        Open SQLite connection in WAL mode
     """
     if db_path is None:
         db_path = str(DB_PATH)
     
-    # Ensure data directory exists
-    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = _connections.get(db_path)
+    if conn is None:
+        # Ensure data directory exists
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL lets history reads proceed while a screening is written,
+        # and NORMAL sync avoids an fsync on every commit
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        _connections[db_path] = conn
+    return conn
+
+
+def _insert_screening(conn: sqlite3.Connection,
+                      result: dict,
+                      resume_filename: str,
+                      jd_filename: str,
+                      resume_text: str = "",
+                      jd_text: str = "") -> int:
+    """
+    Insert one screening row. Callers own the transaction and _lock.
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    Returns:
+        ID of the inserted record
+    """
+    cursor = conn.execute(_INSERT_SCREENING_SQL, (
+        resume_filename,
+        jd_filename,
+        result.get('final_score', 0),
+        result.get('similarity_score', 0),
+        result.get('skill_match_score', 0),
+        result.get('rating', ''),
+        result.get('feedback', ''),
+        json.dumps(result.get('skill_details', {})),
+        resume_text,
+        jd_text
+    ))
+    return cursor.lastrowid
+
+
+def _insert_candidate(conn: sqlite3.Connection,
+                      name: str,
+                      email: str,
+                      phone: str,
+                      resume_text: str,
+                      resume_filename: str) -> int:
+    """
+    Insert one candidate row. Callers own the transaction and _lock.
     
-    # Create screenings table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS screenings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            resume_filename TEXT NOT NULL,
-            jd_filename TEXT NOT NULL,
-            final_score REAL NOT NULL,
-            similarity_score REAL,
-            skill_match_score REAL,
-            rating TEXT,
-            feedback TEXT,
-            skill_details TEXT,
-            resume_text TEXT,
-            jd_text TEXT
-        )
-    """)
+    Returns:
+        ID of the inserted record
+    """
+    cursor = conn.execute(_INSERT_CANDIDATE_SQL, (name, email, phone, resume_text, resume_filename))
+    return cursor.lastrowid
+
+
+def init_db(db_path: str = None) -> None:
+    """
+    Initialize the database schema.
+    
+    Args:
+        db_path: Path to database file
+    """
+    if db_path is None:
+        db_path = str(DB_PATH)
     
-    # Create candidates table (for bulk/history)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS candidates (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            name TEXT,
-            email TEXT,
-            phone TEXT,
-            resume_text TEXT,
-            resume_filename TEXT
+    with _lock, _get_connection(db_path) as conn:
+        # Create screenings table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS screenings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                resume_filename TEXT NOT NULL,
+                jd_filename TEXT NOT NULL,
+                final_score REAL NOT NULL,
+                similarity_score REAL,
+                skill_match_score REAL,
+                rating TEXT,
+                feedback TEXT,
+                skill_details TEXT,
+                resume_text TEXT,
+                jd_text TEXT
+            )
+        """)
+        
+        # Create candidates table (for bulk/history)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                name TEXT,
+                email TEXT,
+                phone TEXT,
+                resume_text TEXT,
+                resume_filename TEXT
+            )
+        """)
+        
+        # Create screening cache table (keyed by resume + JD content hash)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS screen_cache (
+                key BLOB PRIMARY KEY,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                result_json TEXT NOT NULL
+            )
+        """)
+        
+        # Index list views so ORDER BY created_at DESC LIMIT ? avoids a full sort
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_screenings_created ON screenings(created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_candidates_created ON candidates(created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_screen_cache_created ON screen_cache(created_at)"
         )
-    """)
     
-    conn.commit()
-    conn.close()
     logger.info(f"Database initialized at {db_path}")
 
 
@@ -82,118 +201,171 @@ def save_screening_result(result: dict,
         result: Scoring result dict from ResumeMatcher
         resume_filename: Name of the resume file
         jd_filename: Name of the JD file
-        resume_text: Original resume text
-        jd_text: Original JD text
+        resume_text: Resume text to store (truncated by the caller)
+        jd_text: JD text to store (truncated by the caller)
         db_path: Path to database file
         
     Returns:
         ID of the inserted record
     """
-    if db_path is None:
-        db_path = str(DB_PATH)
+    try:
+        with _lock, _get_connection(db_path) as conn:
+            screening_id = _insert_screening(
+                conn, result, resume_filename, jd_filename, resume_text, jd_text
+            )
+        
+        logger.info(f"Saved screening result with ID {screening_id}")
+        return screening_id
+    
+    except Exception as e:
+        logger.error(f"Error saving screening result: {e}")
+        raise
+
+
+def save_screening_and_candidate(result: dict,
+                                 resume_filename: str,
+                                 jd_filename: str,
+                                 resume_text: str = "",
+                                 jd_text: str = "",
+                                 candidate_info: dict = None,
+                                 db_path: str = None) -> int:
+    """
+    Save a screening result and its candidate in a single transaction.
+    The candidate row is only written when a name was extracted.
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    Args:
+        result: Scoring result dict from ResumeMatcher
+        resume_filename: Name of the resume file
+        jd_filename: Name of the JD file
+        resume_text: Resume text to store (truncated by the caller)
+        jd_text: JD text to store (truncated by the caller)
+        candidate_info: Contact info dict with name, email and phone
+        db_path: Path to database file
+        
+    Returns:
+        ID of the inserted screening record
+    """
+    candidate_info = candidate_info or {}
     
     try:
-        cursor.execute("""
-            INSERT INTO screenings 
-            (resume_filename, jd_filename, final_score, similarity_score, 
-             skill_match_score, rating, feedback, skill_details, resume_text, jd_text)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            resume_filename,
-            jd_filename,
-            result.get('final_score', 0),
-            result.get('similarity_score', 0),
-            result.get('skill_match_score', 0),
-            result.get('rating', ''),
-            result.get('feedback', ''),
-            json.dumps(result.get('skill_details', {})),
-            resume_text[:5000],  # Limit to 5000 chars for storage
-            jd_text[:5000]
-        ))
+        with _lock, _get_connection(db_path) as conn:
+            screening_id = _insert_screening(
+                conn, result, resume_filename, jd_filename, resume_text, jd_text
+            )
+            
+            if candidate_info.get('name'):
+                _insert_candidate(
+                    conn,
+                    candidate_info['name'],
+                    candidate_info.get('email', ''),
+                    candidate_info.get('phone', ''),
+                    resume_text,
+                    resume_filename
+                )
         
-        conn.commit()
-        screening_id = cursor.lastrowid
         logger.info(f"Saved screening result with ID {screening_id}")
         return screening_id
     
     except Exception as e:
         logger.error(f"Error saving screening result: {e}")
         raise
-    finally:
-        conn.close()
 
 
-def get_screening_history(limit: int = 50, db_path: str = None) -> List[Dict]:
+def save_screenings_bulk(rows: Sequence[Tuple[dict, str, str, str, str, Optional[dict]]],
+                         db_path: str = None) -> List[int]:
     """
-    Retrieve screening history.
+    Save many screenings and their candidates in a single transaction.
+    As in save_screening_and_candidate, a candidate row is written for
+    every screening whose contact info has a name.
     
     Args:
-        limit: Maximum number of records to retrieve
+        rows: (result, resume_filename, jd_filename, resume_text, jd_text,
+            candidate_info) tuples; texts are truncated by the caller
         db_path: Path to database file
         
     Returns:
-        List of screening result dicts
+        IDs of the inserted screening records, in input order
     """
-    if db_path is None:
-        db_path = str(DB_PATH)
-    
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    screening_ids = []
     
     try:
-        cursor.execute("""
-            SELECT * FROM screenings 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        """, (limit,))
+        with _lock, _get_connection(db_path) as conn:
+            for result, resume_filename, jd_filename, resume_text, jd_text, candidate_info in rows:
+                screening_ids.append(_insert_screening(
+                    conn, result, resume_filename, jd_filename, resume_text, jd_text
+                ))
+                
+                candidate_info = candidate_info or {}
+                if candidate_info.get('name'):
+                    _insert_candidate(
+                        conn,
+                        candidate_info['name'],
+                        candidate_info.get('email', ''),
+                        candidate_info.get('phone', ''),
+                        resume_text,
+                        resume_filename
+                    )
         
-        rows = cursor.fetchall()
-        results = []
+        logger.info(f"Saved {len(screening_ids)} screening results")
+        return screening_ids
+    
+    except Exception as e:
+        logger.error(f"Error saving screening results: {e}")
+        raise
+
+
+def get_screening_history(limit: int = 50, db_path: str = None) -> List[Dict]:
+    """
+    Retrieve screening history.
+    Only summary columns are returned; use get_screening_by_id for details.
+    
+    Args:
+        limit: Maximum number of records to retrieve
+        db_path: Path to database file
         
-        for row in rows:
-            result = dict(row)
-            # Parse skill_details JSON
-            if result.get('skill_details'):
-                try:
-                    result['skill_details'] = json.loads(result['skill_details'])
-                except Exception:
-                    pass
-            results.append(result)
+    Returns:
+        List of screening summary dicts
+    """
+    try:
+        with _lock:
+            rows = _get_connection(db_path).execute(f"""
+                SELECT {_SCREENING_SUMMARY_COLUMNS}
+                FROM screenings 
+                ORDER BY created_at DESC 
+                LIMIT ?
+            """, (limit,)).fetchall()
         
-        return results
+        return [dict(row) for row in rows]
     
     except Exception as e:
         logger.error(f"Error retrieving screening history: {e}")
         return []
-    finally:
-        conn.close()
 
 
-def get_screening_by_id(screening_id: int, db_path: str = None) -> Optional[Dict]:
+def get_screening_by_id(screening_id: int,
+                        db_path: str = None,
+                        *,
+                        include_text: bool = True) -> Optional[Dict]:
     """
     Retrieve a specific screening result by ID.
     
     Args:
         screening_id: ID of the screening record
         db_path: Path to database file
+        include_text: Also return the stored resume_text and jd_text
         
     Returns:
         Screening result dict or None if not found
     """
-    if db_path is None:
-        db_path = str(DB_PATH)
-    
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    columns = _SCREENING_DETAIL_COLUMNS
+    if include_text:
+        columns += ", resume_text, jd_text"
     
     try:
-        cursor.execute("SELECT * FROM screenings WHERE id = ?", (screening_id,))
-        row = cursor.fetchone()
+        with _lock:
+            row = _get_connection(db_path).execute(
+                f"SELECT {columns} FROM screenings WHERE id = ?", (screening_id,)
+            ).fetchone()
         
         if row:
             result = dict(row)
@@ -208,8 +380,6 @@ def get_screening_by_id(screening_id: int, db_path: str = None) -> Optional[Dict
     except Exception as e:
         logger.error(f"Error retrieving screening {screening_id}: {e}")
         return None
-    finally:
-        conn.close()
 
 
 def save_candidate(name: str, email: str, phone: str, 
@@ -222,36 +392,52 @@ def save_candidate(name: str, email: str, phone: str,
         name: Candidate name
         email: Candidate email
         phone: Candidate phone
-        resume_text: Full resume text
+        resume_text: Resume text to store (truncated by the caller)
         resume_filename: Filename of the resume
         db_path: Path to database file
         
     Returns:
         ID of the inserted candidate record
     """
-    if db_path is None:
-        db_path = str(DB_PATH)
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("""
-            INSERT INTO candidates 
-            (name, email, phone, resume_text, resume_filename)
-            VALUES (?, ?, ?, ?, ?)
-        """, (name, email, phone, resume_text, resume_filename))
+        with _lock, _get_connection(db_path) as conn:
+            candidate_id = _insert_candidate(
+                conn, name, email, phone, resume_text, resume_filename
+            )
         
-        conn.commit()
-        candidate_id = cursor.lastrowid
         logger.info(f"Saved candidate {name} with ID {candidate_id}")
         return candidate_id
     
     except Exception as e:
         logger.error(f"Error saving candidate: {e}")
         raise
-    finally:
-        conn.close()
+
+
+def get_corpus_texts(limit: int = 500, db_path: str = None) -> List[str]:
+    """
+    Retrieve stored resume and JD texts to fit the TF-IDF weights on.
+    
+    Args:
+        limit: Maximum number of screenings to read texts from
+        db_path: Path to database file
+        
+    Returns:
+        List of resume and JD texts (most recent screenings first)
+    """
+    try:
+        with _lock:
+            rows = _get_connection(db_path).execute("""
+                SELECT resume_text, jd_text
+                FROM screenings 
+                ORDER BY created_at DESC 
+                LIMIT ?
+            """, (limit,)).fetchall()
+        
+        return [text for row in rows for text in row if text]
+    
+    except Exception as e:
+        logger.error(f"Error retrieving corpus texts: {e}")
+        return []
 
 
 def get_candidates(limit: int = 100, db_path: str = None) -> List[Dict]:
@@ -265,25 +451,74 @@ def get_candidates(limit: int = 100, db_path: str = None) -> List[Dict]:
     Returns:
         List of candidate dicts
     """
-    if db_path is None:
-        db_path = str(DB_PATH)
-    
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("""
-            SELECT id, created_at, name, email, phone, resume_filename 
-            FROM candidates 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        """, (limit,))
+        with _lock:
+            rows = _get_connection(db_path).execute("""
+                SELECT id, created_at, name, email, phone, resume_filename 
+                FROM candidates 
+                ORDER BY created_at DESC 
+                LIMIT ?
+            """, (limit,)).fetchall()
         
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in rows]
     
     except Exception as e:
         logger.error(f"Error retrieving candidates: {e}")
         return []
-    finally:
-        conn.close()
+
+
+def get_cached_screening(cache_key: bytes, db_path: str = None) -> Optional[Dict]:
+    """
+    Look up a previously computed screening by content hash.
+    
+    Args:
+        cache_key: Digest of the resume bytes, JD text and scoring state
+        db_path: Path to database file
+        
+    Returns:
+        Cached screening payload or None on a miss
+    """
+    try:
+        with _lock:
+            row = _get_connection(db_path).execute(
+                "SELECT result_json FROM screen_cache WHERE key = ?", (cache_key,)
+            ).fetchone()
+        
+        return json.loads(row['result_json']) if row else None
+    
+    except Exception as e:
+        logger.error(f"Error reading screening cache: {e}")
+        return None
+
+
+def save_cached_screening(cache_key: bytes, payload: dict, db_path: str = None) -> None:
+    """
+    Store a computed screening payload under its content hash, pruning
+    entries beyond SCREEN_CACHE_MAX_ROWS or SCREEN_CACHE_MAX_AGE_DAYS.
+    
+    Args:
+        cache_key: Digest of the resume bytes, JD text and scoring state
+        payload: JSON-serializable screening payload
+        db_path: Path to database file
+    """
+    try:
+        with _lock, _get_connection(db_path) as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO screen_cache (key, result_json)
+                VALUES (?, ?)
+            """, (cache_key, json.dumps(payload)))
+            conn.execute(
+                "DELETE FROM screen_cache WHERE created_at < datetime('now', ?)",
+                (f"-{SCREEN_CACHE_MAX_AGE_DAYS} days",)
+            )
+            # Rowids grow with every insert (a replaced entry is reinserted),
+            # so everything past the newest SCREEN_CACHE_MAX_ROWS rowids goes
+            conn.execute("""
+                DELETE FROM screen_cache WHERE rowid <= (
+                    SELECT rowid FROM screen_cache ORDER BY rowid DESC LIMIT 1 OFFSET ?
+                )
+            """, (SCREEN_CACHE_MAX_ROWS,))
+    
+    except Exception as e:
+        # A failed cache write must not fail the screening itself
+        logger.error(f"Error writing screening cache: {e}")
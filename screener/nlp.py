@@ -3,27 +3,68 @@ Natural Language Processing module for resume analysis.
 Handles text preprocessing, tokenization, and skill extraction.
 """
 
+import os
 import re
 import json
 import logging
-from typing import List, Dict
+from collections import Counter
+from typing import List, Dict, FrozenSet, Optional
 from pathlib import Path
+import ahocorasick
 import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
 
 logger = logging.getLogger(__name__)
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Runs of whitespace, URLs and email-like tokens, collapsed to a single
+# space by preprocess_text in one pass. The email branch stops where a URL
+# would start so the result matches removing URLs before emails.
+_PP_RE = re.compile(
+    r'(?:\s|http\S+|www\S+'
+    r'|(?:(?!http\S|www\S)\S)+@(?:(?!http\S|www\S)\S)+)+'
+)
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Word tokens for keyword extraction (a single C-level regex scan)
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Set once the required NLTK data has been checked by _ensure_nltk()
+_NLTK_READY = False
+
+# English stopwords, loaded on first use by _get_stopwords()
+_STOPWORDS: Optional[FrozenSet[str]] = None
+
+
+def _ensure_nltk() -> None:
+    """
+    Download required NLTK data on first use instead of at import time,
+    unless a provisioned NLTK_DATA directory is configured.
+    """
+    global _NLTK_READY
+    if _NLTK_READY:
+        return
+    
+    if not os.getenv('NLTK_DATA'):
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt')
+        
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            nltk.download('stopwords')
+    
+    _NLTK_READY = True
+
+
+def _get_stopwords() -> FrozenSet[str]:
+    """Return the English stopword set, loading the NLTK corpus once."""
+    global _STOPWORDS
+    if _STOPWORDS is None:
+        _ensure_nltk()
+        _STOPWORDS = frozenset(stopwords.words('english'))
+    return _STOPWORDS
 
 
 class SkillExtractor:
@@ -38,7 +79,15 @@ class SkillExtractor:
         """
         self.skills_taxonomy = self._load_skills_taxonomy(skills_file)
         self.all_skills = self._flatten_skills_taxonomy()
-        self.stop_words = set(stopwords.words('english'))
+        # Parallel skill/category arrays (longest skill first); automaton
+        # payloads index into these instead of re-probing all_skills
+        items = sorted(self.all_skills.items(), key=lambda item: len(item[0]), reverse=True)
+        self._skill_list = [skill for skill, _ in items]
+        self._skill_category = [category for _, category in items]
+        # {skill: position}, shared with ResumeMatcher for bitset encoding
+        self.skill_index = {skill: i for i, skill in enumerate(self._skill_list)}
+        self.automaton = self._build_automaton()
+        self.stop_words = _get_stopwords()
     
     def _load_skills_taxonomy(self, skills_file: str = None) -> dict:
         """Load skills taxonomy from JSON file."""
@@ -66,14 +115,31 @@ class SkillExtractor:
     def _flatten_skills_taxonomy(self) -> Dict[str, str]:
         """
         Flatten taxonomy into {skill: category} mapping.
+        Skills are normalized (lowercased, stripped) once here so matching
+        never has to touch them again.
         Example: {"python": "programming_languages", ...}
         """
         flattened = {}
         for category, skills in self.skills_taxonomy.items():
             for skill in skills:
-                flattened[skill.lower()] = category
+                skill = skill.strip().lower()
+                if skill:
+                    flattened[skill] = category
         return flattened
     
+    def _build_automaton(self) -> ahocorasick.Automaton:
+        """
+        Build an Aho-Corasick automaton over all skills so a single
+        pass over the text finds every occurrence. Each skill is stored
+        as its index into the skill arrays plus its length offset so match
+        positions need no recomputation.
+        """
+        automaton = ahocorasick.Automaton()
+        for i, skill in enumerate(self._skill_list):
+            automaton.add_word(skill, (i, len(skill) - 1))
+        automaton.make_automaton()
+        return automaton
+    
     def extract_skills(self, text: str, threshold: int = 1) -> dict:
         """
         Extract skills from text.
@@ -85,18 +151,31 @@ class SkillExtractor:
         Returns:
             Dictionary with found skills by category and their frequencies
         """
-        text_lower = text.lower()
+        # Normalized input is already lowercase; avoid copying it again
+        text_lower = text if text.islower() else text.lower()
+        text_len = len(text_lower)
         skills_found = {}
         skill_frequencies = {}
+        counts = Counter()
         
-        for skill in self.all_skills.keys():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            matches = re.findall(pattern, text_lower)
-            count = len(matches)
-            
+        # Bind hot-loop lookups to locals
+        is_word_char = _is_word_char
+        skill_list = self._skill_list
+        skill_category = self._skill_category
+        
+        for end_idx, (i, offset) in self.automaton.iter(text_lower):
+            # Enforce word boundaries to avoid partial matches
+            start_idx = end_idx - offset
+            if start_idx > 0 and is_word_char(text_lower[start_idx - 1]):
+                continue
+            if end_idx + 1 < text_len and is_word_char(text_lower[end_idx + 1]):
+                continue
+            counts[i] += 1
+        
+        for i, count in counts.items():
             if count >= threshold:
-                category = self.all_skills[skill]
+                skill = skill_list[i]
+                category = skill_category[i]
                 if category not in skills_found:
                     skills_found[category] = []
                 skills_found[category].append(skill)
@@ -109,6 +188,11 @@ class SkillExtractor:
         }
 
 
+def _is_word_char(char: str) -> bool:
+    """Return True if char would be matched by the regex class \\w."""
+    return char.isalnum() or char == '_'
+
+
 def preprocess_text(text: str) -> str:
     """
     Preprocess text for NLP: lowercase, remove special chars, etc.
@@ -119,15 +203,9 @@ def preprocess_text(text: str) -> str:
     Returns:
         Preprocessed text
     """
-    # Lowercase
-    text = text.lower()
-    # Remove URLs
-    text = re.sub(r'http\S+|www\S+', '', text)
-    # Remove email-like patterns (but not the @ symbol if we need it)
-    text = re.sub(r'\S+@\S+', '', text)
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # Lowercase, then drop URLs and email-like patterns and collapse
+    # whitespace in a single scan
+    return _PP_RE.sub(' ', text.lower()).strip()
 
 
 def tokenize_text(text: str) -> List[str]:
@@ -140,7 +218,7 @@ def tokenize_text(text: str) -> List[str]:
     Returns:
         List of word tokens
     """
-    return word_tokenize(text.lower())
+    return _TOKEN_RE.findall(text.lower())
 
 
 def get_sentences(text: str) -> List[str]:
@@ -153,6 +231,7 @@ def get_sentences(text: str) -> List[str]:
     Returns:
         List of sentences
     """
+    _ensure_nltk()
     try:
         return sent_tokenize(text)
     except Exception as e:
@@ -171,15 +250,12 @@ def extract_keywords(text: str, top_n: int = 20) -> List[str]:
     Returns:
         List of top keywords
     """
-    stop_words = set(stopwords.words('english'))
-    tokens = tokenize_text(text)
-    
-    # Filter stopwords and short tokens
-    keywords = [token for token in tokens if token.isalnum() and token not in stop_words and len(token) > 2]
-    
-    # Count frequencies
-    from collections import Counter
-    freq_dist = Counter(keywords)
+    # Count tokens, skipping stopwords and short tokens
+    stop_words = _get_stopwords()
+    freq_dist = Counter(
+        token for token in tokenize_text(text)
+        if len(token) > 2 and token not in stop_words
+    )
     
     # Return top N
     top_keywords = [word for word, _ in freq_dist.most_common(top_n)]
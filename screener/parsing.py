@@ -10,13 +10,38 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used on every screening request
+_WS_RE = re.compile(r'\s+')
+_SPECIAL_RE = re.compile(r'[^\w\s\-\.]')
+# Runs of anything outside [\w-.] plus URL remnants, for normalize_text
+_NORMALIZE_RE = re.compile(r'(?:[^\w\-\.]|http[\w\-\.]+|www[\w\-\.]+)+')
+# Email and phone (basic US format) in one alternation so contact info is found in a single scan
+_CONTACT_RE = re.compile(
+    r'(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    r'|(?P<phone>(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})'
+)
+# Resumes are short and scoring only uses the first few thousand characters,
+# so PDF extraction stops once either budget is reached
+MAX_PDF_PAGES = 10
+MAX_PDF_CHARS = 20000
 
-def extract_text_from_pdf(file_path: str) -> str:
+# Name candidates are only looked for near the top of the resume
+_NAME_SCAN_CHARS = 512
+_NAME_SCAN_LINES = 5
+
+
+def extract_text_from_pdf(file_path: str,
+                          max_pages: int = MAX_PDF_PAGES,
+                          max_chars: int = MAX_PDF_CHARS) -> str:
     """
     Extract text from a PDF file.
+    Pages are decoded lazily and extraction stops after max_pages pages
+    or once max_chars characters have been gathered.
     
     Args:
         file_path: Path to the PDF file
+        max_pages: Maximum number of pages to decode
+        max_chars: Stop once this many characters have been extracted
         
     Returns:
         Extracted text as a string
@@ -26,16 +51,21 @@ def extract_text_from_pdf(file_path: str) -> str:
     """
     try:
         text = []
+        total_chars = 0
         with open(file_path, 'rb') as f:
             reader = PyPDF2.PdfReader(f)
             if len(reader.pages) == 0:
                 raise ValueError("PDF file is empty.")
             
             for page_num, page in enumerate(reader.pages):
+                if page_num >= max_pages or total_chars >= max_chars:
+                    logger.info(f"Stopped PDF extraction after {page_num} pages ({total_chars} chars)")
+                    break
                 try:
                     page_text = page.extract_text()
                     if page_text:
                         text.append(page_text)
+                        total_chars += len(page_text)
                 except Exception as e:
                     logger.warning(f"Could not extract text from page {page_num}: {e}")
         
@@ -117,14 +147,29 @@ def clean_text(text: str) -> str:
         Cleaned text
     """
     # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     # Remove leading/trailing whitespace
     text = text.strip()
     # Remove special characters but keep alphanumeric, spaces, and common punctuation
-    text = re.sub(r'[^\w\s\-\.]', ' ', text)
+    text = _SPECIAL_RE.sub(' ', text)
     return text
 
 
+def normalize_text(text: str) -> str:
+    """
+    Clean and preprocess text for NLP in a single pass.
+    Equivalent to nlp.preprocess_text(clean_text(text)): lowercases, keeps
+    alphanumerics, hyphens and dots, drops URLs and collapses whitespace.
+    
+    Args:
+        text: Raw text
+        
+    Returns:
+        Normalized text
+    """
+    return _NORMALIZE_RE.sub(' ', text.lower()).strip()
+
+
 def extract_contact_info(text: str) -> dict:
     """
     Extract basic contact information from resume text.
@@ -141,21 +186,17 @@ def extract_contact_info(text: str) -> dict:
         'name': None
     }
     
-    # Extract email
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    email_match = re.search(email_pattern, text)
-    if email_match:
-        info['email'] = email_match.group()
-    
-    # Extract phone (basic US format)
-    phone_pattern = r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'
-    phone_match = re.search(phone_pattern, text)
-    if phone_match:
-        info['phone'] = phone_match.group()
+    # Extract email and phone in a single pass, stopping once both are found
+    for match in _CONTACT_RE.finditer(text):
+        kind = match.lastgroup
+        if info[kind] is None:
+            info[kind] = match.group()
+            if info['email'] and info['phone']:
+                break
     
     # Extract name (first line that looks like a name)
-    lines = text.split('\n')
-    for line in lines[:5]:  # Check first 5 lines
+    lines = text[:_NAME_SCAN_CHARS].split('\n', _NAME_SCAN_LINES)
+    for line in lines[:_NAME_SCAN_LINES]:  # Check first 5 lines
         cleaned = line.strip()
         if cleaned and 2 <= len(cleaned.split()) <= 4 and len(cleaned) < 60:
             info['name'] = cleaned
@@ -3,25 +3,354 @@ Scoring and matching module for resume-to-JD comparison.
 Uses TF-IDF and keyword matching for scoring.
 """
 
+import hashlib
+import heapq
 import logging
-from typing import Dict, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+from collections import OrderedDict
+from itertools import chain
+from typing import Dict, FrozenSet, List, Tuple
+import joblib
+import numpy as np
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
 
 logger = logging.getLogger(__name__)
 
+# Number of transformed TF-IDF rows kept per matcher, keyed by text digest
+ROW_CACHE_SIZE = 1024
+
+# Width of the hashed unigram/bigram feature space
+HASH_FEATURES = 2 ** 14
+
+# Combined non-zeros up to which _row_dot intersects sorted indices
+# instead of scattering into a dense scratch vector
+MERGE_DOT_MAX_NNZ = 128
+
+# Star ratings and the composite-score thresholds (0-100) between them
+RATINGS = ("⭐", "⭐⭐", "⭐⭐⭐", "⭐⭐⭐⭐", "⭐⭐⭐⭐⭐")
+RATING_THRESHOLDS = np.array([20, 40, 60, 80])
+
+
+def _row_dot(a, b) -> float:
+    """
+    Dot product of two sparse 1 x n CSR rows with sorted indices.
+    TF-IDF rows are L2-normalized, so this is their cosine similarity;
+    it is clamped to [0, 1] to absorb float32 rounding.
+    """
+    if not a.nnz or not b.nnz:
+        return 0.0
+    
+    if a.nnz + b.nnz <= MERGE_DOT_MAX_NNZ:
+        # Short rows: binary-search the shorter row's columns in the
+        # longer one's sorted indices, no dense scratch needed
+        if a.nnz < b.nnz:
+            a, b = b, a
+        positions = np.searchsorted(a.indices, b.indices)
+        positions[positions == a.nnz] = 0
+        hits = a.indices[positions] == b.indices
+        product = float(np.dot(a.data[positions[hits]], b.data[hits]))
+    else:
+        # Scatter one row into a dense scratch and gather at the other's
+        # columns, straight from the CSR arrays (no sparse product matrix)
+        scratch = np.zeros(a.shape[1], dtype=a.data.dtype)
+        scratch[a.indices] = a.data
+        product = float(np.dot(scratch[b.indices], b.data))
+    return min(1.0, max(0.0, product))
+
+
+def _text_key(text: str) -> bytes:
+    """Content digest used as the key of the per-text LRU caches."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def _cache_lookup(cache: OrderedDict, text: str, compute, key: bytes = None):
+    """
+    Return compute(text) through an LRU cache keyed by the text's digest.
+    
+    Args:
+        cache: OrderedDict used as the LRU store
+        text: Text to look up
+        compute: Called with text on a cache miss
+        key: The text's _text_key, if the caller already has it
+        
+    Returns:
+        The cached or freshly computed value
+    """
+    if key is None:
+        key = _text_key(text)
+    value = cache.get(key)
+    if value is None:
+        value = compute(text)
+        cache[key] = value
+        if len(cache) > ROW_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+
+def _flatten_skills(skills: dict) -> FrozenSet[str]:
+    """Collect all skills from a SkillExtractor result into one set."""
+    return frozenset(chain.from_iterable(skills.get("by_category", {}).values()))
+
+
+def _skill_names(resume_flat: FrozenSet[str],
+                 jd_flat: FrozenSet[str],
+                 k_matched: int = None,
+                 k_missing: int = None) -> Tuple[List[str], List[str]]:
+    """
+    Alphabetically first matched and missing skill names.
+    
+    Args:
+        resume_flat: Flattened resume skills
+        jd_flat: Flattened JD skills
+        k_matched: Number of matched names to return (all if None)
+        k_missing: Number of missing names to return (all if None)
+        
+    Returns:
+        Tuple of (matched names, missing names), each sorted
+    """
+    matched = jd_flat.intersection(resume_flat)
+    missing = jd_flat.difference(matched)
+    # A partial selection is O(n log k) instead of sorting everything
+    return (
+        sorted(matched) if k_matched is None else heapq.nsmallest(k_matched, matched),
+        sorted(missing) if k_missing is None else heapq.nsmallest(k_missing, missing)
+    )
+
+
+def _skill_match(resume_flat: FrozenSet[str], jd_flat: FrozenSet[str]) -> Tuple[float, Dict]:
+    """Skill match score and details for flattened skill sets."""
+    if not jd_flat:
+        # No skills required in JD
+        return 1.0, {"matched": [], "missing": [], "required": 0}
+    
+    # Calculate intersection (CPython probes with the smaller set)
+    matched, missing = _skill_names(resume_flat, jd_flat)
+    
+    # Score: ratio of matched to required
+    score = len(matched) / len(jd_flat)
+    
+    return float(score), {
+        "matched": matched,
+        "missing": missing,
+        "required": len(jd_flat),
+        "found": len(resume_flat)
+    }
+
+
+def _encode_bits(skills, skill_index: Dict[str, int]) -> np.ndarray:
+    """
+    Encode a skill set as a packed uint64 bitset over skill_index.
+    The skill with index i sets bit i % 64 of word i // 64.
+    """
+    bits = np.zeros((len(skill_index) + 63) // 64, dtype=np.uint64)
+    positions = np.fromiter((skill_index[skill] for skill in skills), dtype=np.intp, count=len(skills))
+    np.bitwise_or.at(bits, positions >> 6, np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64)))
+    return bits
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """Count the set bits along the last axis of a uint64 bitset array."""
+    if hasattr(np, 'bitwise_count'):
+        # NumPy >= 2.0 has a native (SIMD) popcount
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(bits.astype('<u8', copy=False).view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+def _bit_positions(bits: np.ndarray) -> np.ndarray:
+    """Return the indices of the set bits in a 1-D uint64 bitset."""
+    return np.flatnonzero(np.unpackbits(bits.astype('<u8', copy=False).view(np.uint8), bitorder='little'))
+
+
+class JDContext:
+    """
+    JD-side scoring inputs, computed once and reused for every resume
+    screened against the same job description.
+    """
+    
+    def __init__(self, jd_text: str, jd_skills: dict, matcher: "ResumeMatcher"):
+        """
+        Precompute the JD vector and skill sets.
+        
+        Args:
+            jd_text: Preprocessed job description text
+            jd_skills: Skills extracted from the JD
+            matcher: Matcher whose vectorizer is used
+        """
+        self.jd_text = jd_text
+        self.jd_skills = jd_skills
+        self.jd_vec = matcher._transform_one(jd_text)
+        self.jd_flat = _flatten_skills(jd_skills)
+
 
 class ResumeMatcher:
     """Match resume to job description and generate scores."""
     
-    def __init__(self):
-        """Initialize the matcher."""
-        self.vectorizer = TfidfVectorizer(
+    def __init__(self, skill_index: Dict[str, int] = None):
+        """
+        Initialize the matcher.
+        
+        Args:
+            skill_index: Optional {skill: bit position} mapping (see
+                SkillExtractor.skill_index) used to encode skill sets as
+                bitsets; a per-batch index is built when omitted
+        """
+        # Stateless: n-grams are hashed straight into a fixed feature space,
+        # so there is no vocabulary to fit per resume/JD pair
+        self.vectorizer = HashingVectorizer(
+            n_features=HASH_FEATURES,
+            alternate_sign=False,
             lowercase=True,
             stop_words='english',
-            max_features=500,
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            norm='l2',
+            # Half the bytes of float64 per stored entry; ample precision
+            # for values in [0, 1]
+            dtype=np.float32
         )
+        # The analyzer (token regex, stop words, bigrams) and hasher are built
+        # once here; HashingVectorizer.transform rebuilds both on every call
+        self._analyze = self.vectorizer.build_analyzer()
+        self._hasher = FeatureHasher(
+            n_features=HASH_FEATURES,
+            input_type='string',
+            alternate_sign=False,
+            dtype=np.float32
+        )
+        # IDF weights, fitted on a corpus via fit_corpus()
+        self.transformer = TfidfTransformer()
+        self._fitted = False
+        self._row_cache = OrderedDict()
+        self._word_count_cache = OrderedDict()
+        self.skill_index = skill_index
+        self._skill_names = None
+        if skill_index is not None:
+            self._skill_names = [None] * len(skill_index)
+            for skill, i in skill_index.items():
+                self._skill_names[i] = skill
+    
+    def fit_corpus(self, texts: List[str]) -> None:
+        """
+        Fit IDF weights once on a corpus of resumes/JDs.
+        Afterwards hashed term frequencies are IDF-weighted before scoring;
+        without a corpus they are compared as-is.
+        
+        Args:
+            texts: Preprocessed resume and job description texts
+        """
+        self.transformer.fit(self.vectorizer.transform(texts))
+        self._fitted = True
+        self._row_cache.clear()
+        logger.info(f"Fitted TF-IDF weights on {len(texts)} documents")
+    
+    def fingerprint(self) -> bytes:
+        """
+        Digest of the state that determines scores: the hashed feature
+        width, the fitted IDF weights (if any) and the skill index.
+        
+        Returns:
+            16-byte blake2b digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(HASH_FEATURES).encode('utf-8'))
+        if self._fitted:
+            digest.update(self.transformer.idf_.tobytes())
+        if self.skill_index is not None:
+            digest.update(repr(sorted(self.skill_index.items())).encode('utf-8'))
+        return digest.digest()
+    
+    def save(self, path: str) -> None:
+        """
+        Persist the fitted IDF weights and skill index with joblib.
+        The file is written next to path and then renamed, so concurrent
+        readers never see a partial file.
+        
+        Args:
+            path: Destination file
+        """
+        state = {
+            "hash_features": HASH_FEATURES,
+            "transformer": self.transformer if self._fitted else None,
+            "skill_index": self.skill_index
+        }
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        joblib.dump(state, tmp_path, compress=3)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved matcher state to {path}")
+    
+    @classmethod
+    def load(cls, path: str, skill_index: Dict[str, int] = None) -> "ResumeMatcher":
+        """
+        Restore a matcher saved with save(), without refitting.
+        
+        Args:
+            path: File written by save()
+            skill_index: Current skill index (see SkillExtractor.skill_index)
+                to use instead of the saved one, which goes stale once the
+                taxonomy is edited
+            
+        Returns:
+            ResumeMatcher with the saved IDF weights and the given (or saved)
+            skill index
+            
+        Raises:
+            ValueError: If the file was saved with a different feature width
+        """
+        state = joblib.load(path)
+        if state["hash_features"] != HASH_FEATURES:
+            raise ValueError(f"Matcher state in {path} uses {state['hash_features']} features, "
+                             f"expected {HASH_FEATURES}")
+        
+        matcher = cls(skill_index=state["skill_index"] if skill_index is None else skill_index)
+        if state["transformer"] is not None:
+            matcher.transformer = state["transformer"]
+            matcher._fitted = True
+        logger.info(f"Loaded matcher state from {path}")
+        return matcher
+    
+    def _transform_one(self, text: str, key: bytes = None):
+        """
+        Vectorize a single text, applying IDF weights once fitted.
+        Rows are cached by content digest so repeated texts skip tokenization.
+        
+        Args:
+            text: Preprocessed text
+            key: The text's _text_key, if already computed
+            
+        Returns:
+            L2-normalized sparse row (1 x HASH_FEATURES)
+        """
+        return _cache_lookup(self._row_cache, text, self._vectorize, key)
+    
+    def _tokens(self, text: str) -> List[str]:
+        """
+        Tokenize text with the vectorizer's analyzer.
+        
+        Args:
+            text: Preprocessed text
+            
+        Returns:
+            Unigram and bigram tokens, stop words removed
+        """
+        return self._analyze(text)
+    
+    def _vectorize(self, text: str):
+        """Hash a text into a sparse row and IDF-weight it if fitted."""
+        # Same result as self.vectorizer.transform([text]), without
+        # rebuilding the analyzer and hasher
+        row = normalize(self._hasher.transform([self._tokens(text)]), norm='l2', copy=False)
+        if self._fitted:
+            row = self.transformer.transform(row)
+        # _row_dot relies on sorted column indices
+        row.sort_indices()
+        return row
+    
+    def _word_count(self, text: str, key: bytes = None) -> int:
+        """Whitespace-separated word count, cached by content digest (key, if given)."""
+        return _cache_lookup(self._word_count_cache, text, lambda t: len(t.split()), key)
     
     def calculate_similarity_score(self, resume_text: str, jd_text: str) -> float:
         """
@@ -34,17 +363,14 @@ class ResumeMatcher:
         Returns:
             Similarity score between 0 and 1
         """
-        try:
-            # Combine texts and fit vectorizer
-            texts = [resume_text, jd_text]
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return float(similarity)
-        except Exception as e:
-            logger.error(f"Error calculating similarity: {e}")
+        if not resume_text.strip() or not jd_text.strip():
             return 0.0
+        
+        resume_vec = self._transform_one(resume_text)
+        jd_vec = self._transform_one(jd_text)
+        
+        # Rows are L2-normalized, so cosine similarity is their dot product
+        return _row_dot(resume_vec, jd_vec)
     
     def calculate_skill_match_score(self, resume_skills: dict, jd_skills: dict) -> Tuple[float, Dict]:
         """
@@ -57,34 +383,65 @@ class ResumeMatcher:
         Returns:
             Tuple of (score: float, details: dict)
         """
-        resume_flat = set()
-        jd_flat = set()
+        # Flatten the (usually small) JD side first so a JD without skills
+        # never pays for flattening the resume
+        jd_flat = _flatten_skills(jd_skills)
         
-        # Flatten resume skills
-        for category, skills in resume_skills.get("by_category", {}).items():
-            resume_flat.update(skills)
+        if not jd_flat:
+            # No skills required in JD
+            return 1.0, {"matched": [], "missing": [], "required": 0}
         
-        # Flatten JD skills
-        for category, skills in jd_skills.get("by_category", {}).items():
-            jd_flat.update(skills)
+        return _skill_match(_flatten_skills(resume_skills), jd_flat)
+    
+    def score_resumes_batch(self, 
+                            resume_skills_list: List[dict], 
+                            jd_skills: dict) -> List[Tuple[float, Dict]]:
+        """
+        Calculate skill match scores for many resumes against one JD.
+        Skill sets are encoded as packed uint64 bitsets over the skill
+        index and scored with AND + popcount instead of per-pair Python sets.
+        
+        Args:
+            resume_skills_list: Skills extracted from each resume
+            jd_skills: Skills extracted from the JD
+            
+        Returns:
+            List of (score, details) tuples in input order, as returned by
+            calculate_skill_match_score
+        """
+        jd_flat = _flatten_skills(jd_skills)
+        resume_flats = [_flatten_skills(skills) for skills in resume_skills_list]
+        
+        if not resume_flats:
+            return []
         
         if not jd_flat:
             # No skills required in JD
-            return 1.0, {"matched": [], "missing": [], "required": 0}
+            return [(1.0, {"matched": [], "missing": [], "required": 0}) for _ in resume_flats]
         
-        # Calculate intersection
-        matched = resume_flat & jd_flat
-        missing = jd_flat - resume_flat
+        universe = jd_flat.union(*resume_flats)
+        index, names = self.skill_index, self._skill_names
+        if index is None or not universe.issubset(index):
+            # Skills outside the shared index: fall back to a per-batch index
+            names = sorted(universe)
+            index = {skill: i for i, skill in enumerate(names)}
         
-        # Score: ratio of matched to required
-        score = len(matched) / len(jd_flat) if jd_flat else 0.0
+        resume_bits = np.stack([_encode_bits(flat, index) for flat in resume_flats])
+        jd_bits = _encode_bits(jd_flat, index)
         
-        return float(score), {
-            "matched": sorted(list(matched)),
-            "missing": sorted(list(missing)),
-            "required": len(jd_flat),
-            "found": len(resume_flat)
-        }
+        hits = resume_bits & jd_bits
+        misses = jd_bits & ~resume_bits
+        scores = _popcount(hits) / len(jd_flat)
+        
+        return [
+            (float(scores[row]), {
+                "matched": sorted(names[i] for i in _bit_positions(hits[row])),
+                "missing": sorted(names[i] for i in _bit_positions(misses[row])),
+                "required": len(jd_flat),
+                "found": len(resume_flats[row])
+            })
+            for row in range(len(resume_flats))
+        ]
     
     def generate_composite_score(self, 
                                  similarity_score: float, 
@@ -109,11 +466,38 @@ class ResumeMatcher:
         
         return composite * 100
     
+    def score_batch(self,
+                    similarities: np.ndarray,
+                    skill_matches: np.ndarray,
+                    weights: dict = None) -> Tuple[np.ndarray, List[str]]:
+        """
+        Composite scores and star ratings for many resumes at once.
+        Element-wise equivalent to generate_composite_score and
+        _score_to_rating, computed as whole-array operations.
+        
+        Args:
+            similarities: TF-IDF similarity per resume (0-1)
+            skill_matches: Skill match ratio per resume (0-1)
+            weights: Dict with 'similarity' and 'skills' weights (default: equal)
+            
+        Returns:
+            Tuple of (composite scores 0-100, star ratings)
+        """
+        if weights is None:
+            weights = {"similarity": 0.5, "skills": 0.5}
+        
+        composite = (np.asarray(similarities, dtype=np.float64) * weights["similarity"] +
+                     np.asarray(skill_matches, dtype=np.float64) * weights["skills"]) * 100
+        
+        bins = np.digitize(composite, RATING_THRESHOLDS)
+        return composite, [RATINGS[b] for b in bins.tolist()]
+    
     def generate_feedback(self, 
                          resume_text: str,
                          jd_text: str,
                          skill_match_details: dict,
-                         composite_score: float) -> str:
+                         composite_score: float,
+                         resume_word_count: int = None) -> str:
         """
         Generate human-readable feedback based on scoring.
         
@@ -122,6 +506,8 @@ class ResumeMatcher:
             jd_text: Job description text
             skill_match_details: Skill matching details
             composite_score: Overall composite score (0-100)
+            resume_word_count: Words in the resume (counted from
+                resume_text if not given)
             
         Returns:
             Feedback string
@@ -156,7 +542,9 @@ class ResumeMatcher:
                        f"\nResume includes {found} relevant skills")
         
         # Length feedback
-        resume_words = len(resume_text.split())
+        resume_words = resume_word_count
+        if resume_words is None:
+            resume_words = self._word_count(resume_text)
         if resume_words < 100:
             feedback.append("\nNote: Resume is quite short. Consider adding more details.")
         elif resume_words > 1500:
@@ -183,36 +571,84 @@ class ResumeMatcher:
         Returns:
             Complete scoring result dict
         """
-        # Calculate similarity score
-        similarity = self.calculate_similarity_score(resume_text, jd_text)
+        return self.score_against(resume_text, resume_skills, JDContext(jd_text, jd_skills, self), weights)
+    
+    def score_against(self,
+                      resume_text: str,
+                      resume_skills: dict,
+                      jd_ctx: JDContext,
+                      weights: dict = None) -> dict:
+        """
+        Complete scoring pipeline for a resume against a precomputed JD.
+        Only the resume side is vectorized and flattened.
         
-        # Calculate skill match score
-        skill_match, skill_details = self.calculate_skill_match_score(resume_skills, jd_skills)
+        Args:
+            resume_text: Resume text
+            resume_skills: Extracted skills from resume
+            jd_ctx: JD context built once per job description
+            weights: Scoring weights
+            
+        Returns:
+            Complete scoring result dict, as returned by score_resume
+        """
+        return self.score_many_against([resume_text], [resume_skills], jd_ctx, weights)[0]
+    
+    def score_many_against(self,
+                           resume_texts: List[str],
+                           resume_skills_list: List[dict],
+                           jd_ctx: JDContext,
+                           weights: dict = None) -> List[dict]:
+        """
+        Complete scoring pipeline for many resumes against a precomputed JD.
+        Skill matches come from one bitset pass (score_resumes_batch) and
+        composite scores and ratings from one array pass (score_batch);
+        only similarity and feedback are computed per resume.
+        
+        Args:
+            resume_texts: Resume texts
+            resume_skills_list: Extracted skills from each resume
+            jd_ctx: JD context built once per job description
+            weights: Scoring weights
+            
+        Returns:
+            One scoring result dict per resume, in input order, as
+            returned by score_resume
+        """
+        if not resume_texts:
+            return []
         
-        # Generate composite score
-        composite = self.generate_composite_score(similarity, skill_match, weights)
+        # Each resume is hashed once; the digest keys both the row and the
+        # word count cache
+        keys = [_text_key(text) for text in resume_texts]
         
-        # Generate feedback
-        feedback = self.generate_feedback(resume_text, jd_text, skill_details, composite)
+        # Calculate similarity scores against the stored JD row
+        similarities = [_row_dot(self._transform_one(text, key), jd_ctx.jd_vec)
+                        for text, key in zip(resume_texts, keys)]
         
-        return {
-            "final_score": round(composite, 2),
-            "similarity_score": round(similarity * 100, 2),
-            "skill_match_score": round(skill_match * 100, 2),
-            "skill_details": skill_details,
-            "feedback": feedback,
-            "rating": self._score_to_rating(composite)
-        }
+        # Calculate skill match scores
+        skill_results = self.score_resumes_batch(resume_skills_list, jd_ctx.jd_skills)
+        
+        # Generate composite scores and ratings
+        composites, ratings = self.score_batch(similarities, [score for score, _ in skill_results], weights)
+        
+        results = []
+        for resume_text, key, similarity, (skill_match, skill_details), composite, rating in zip(
+                resume_texts, keys, similarities, skill_results, composites.tolist(), ratings):
+            # Generate feedback (the word count is cached per resume text)
+            feedback = self.generate_feedback(resume_text, jd_ctx.jd_text, skill_details, composite,
+                                              self._word_count(resume_text, key))
+            
+            results.append({
+                "final_score": round(composite, 2),
+                "similarity_score": round(similarity * 100, 2),
+                "skill_match_score": round(skill_match * 100, 2),
+                "skill_details": skill_details,
+                "feedback": feedback,
+                "rating": rating
+            })
+        
+        return results
     
     def _score_to_rating(self, score: float) -> str:
-        """Convert numeric score to star rating."""
-        if score >= 80:
-            return "⭐⭐⭐⭐⭐"
-        elif score >= 60:
-            return "⭐⭐⭐⭐"
-        elif score >= 40:
-            return "⭐⭐⭐"
-        elif score >= 20:
-            return "⭐⭐"
-        else:
-            return "⭐"
+        """Convert numeric score to star rating (one star per 20 points)."""
+        return RATINGS[max(0, min(int(score) // 20, 4))]
@@ -1,2 +1,2 @@
 #!/usr/bin/env bash
-gunicorn app:app
\ No newline at end of file
+hypercorn app:app
\ No newline at end of file
@@ -6,16 +6,26 @@ Tests the screening endpoint with sample data
 import requests
 import time
 
-# Wait for server to be ready
-print("Waiting for server to start...")
-time.sleep(2)
-
 BASE_URL = "http://localhost:5000"
 
+# One session for every call so the keep-alive connection is reused
+S = requests.Session()
+
+# Wait for server to be ready (poll the health check for up to 10 seconds)
+print("Waiting for server to start...")
+deadline = time.monotonic() + 10
+while time.monotonic() < deadline:
+    try:
+        if S.get(f"{BASE_URL}/api/health", timeout=0.2).status_code == 200:
+            break
+    except requests.RequestException:
+        pass
+    time.sleep(0.1)
+
 # Test 1: Health check
 print("\n=== Test 1: Health Check ===")
 try:
-    response = requests.get(f"{BASE_URL}/api/health")
+    response = S.get(f"{BASE_URL}/api/health")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
 except Exception as e:
@@ -33,7 +43,7 @@ try:
     files = {'resume': open('test_resume.txt', 'rb')}
     data = {'jd_text': jd_text}
     
-    response = requests.post(f"{BASE_URL}/api/screen", files=files, data=data)
+    response = S.post(f"{BASE_URL}/api/screen", files=files, data=data)
     
     files['resume'].close()
     
@@ -73,7 +83,7 @@ except Exception as e:
 # Test 3: Get screening history
 print("\n=== Test 3: Screening History ===")
 try:
-    response = requests.get(f"{BASE_URL}/api/history")
+    response = S.get(f"{BASE_URL}/api/history")
     print(f"Status: {response.status_code}")
     results = response.json()
     print(f"Number of screenings: {len(results)}")
@@ -86,7 +96,7 @@ except Exception as e:
 # Test 4: Get specific screening
 print("\n=== Test 4: Get Specific Screening ===")
 try:
-    response = requests.get(f"{BASE_URL}/api/screening/1")
+    response = S.get(f"{BASE_URL}/api/screening/1")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
         data = response.json()
@@ -98,6 +108,64 @@ try:
 except Exception as e:
     print(f"❌ Test 4 FAILED: {e}")
 
+# Test 5: Bulk screen (two different resumes uploaded under the same name)
+print("\n=== Test 5: Bulk Screen Resumes (API) ===")
+try:
+    with open('test_resume.txt', 'rb') as f:
+        resume_bytes = f.read()
+    other_resume = b"Jane Roe\nGo developer with rust, python and kubernetes experience"
+    
+    files = [
+        ('resumes', ('cv.txt', resume_bytes, 'text/plain')),
+        ('resumes', ('cv.txt', other_resume, 'text/plain')),
+    ]
+    data = {'jd_text': jd_text}
+    
+    response = S.post(f"{BASE_URL}/api/bulk_screen", files=files, data=data)
+    print(f"Status: {response.status_code}")
+    results = response.json()
+    
+    for result in results:
+        print(f"  {result['candidate_info'].get('name')}: {result.get('final_score')}/100 "
+              f"(Screening ID: {result.get('screening_id')})")
+    
+    names = {result['candidate_info'].get('name') for result in results}
+    scores = [result['final_score'] for result in results]
+    assert response.status_code == 200 and len(results) == 2, "expected two results"
+    assert names == {'John Smith', 'Jane Roe'}, f"uploads were mixed up: {names}"
+    assert scores == sorted(scores, reverse=True), "results are not ranked by score"
+    print("✅ Test 5 PASSED")
+except Exception as e:
+    print(f"❌ Test 5 FAILED: {e}")
+
+# Test 6: Bulk screen with a bad upload (only that file fails)
+print("\n=== Test 6: Bulk Screen With A Bad Upload (API) ===")
+try:
+    files = [
+        ('resumes', ('cv.txt', resume_bytes, 'text/plain')),
+        ('resumes', ('empty.txt', b'', 'text/plain')),
+    ]
+    response = S.post(f"{BASE_URL}/api/bulk_screen", files=files, data={'jd_text': jd_text})
+    print(f"Status: {response.status_code}")
+    results = response.json()
+    
+    for result in results:
+        print(f"  {result['resume_filename']}: {result.get('final_score', result.get('error'))}")
+    
+    assert response.status_code == 200 and len(results) == 2, "expected a result and an error entry"
+    assert 'screening_id' in results[0] and 'error' in results[1], "bad upload was not reported on its own"
+    
+    # With no usable upload at all the request is rejected
+    files = [('resumes', ('empty.txt', b'', 'text/plain'))]
+    response = S.post(f"{BASE_URL}/api/bulk_screen", files=files, data={'jd_text': jd_text})
+    print(f"Status (only bad uploads): {response.status_code}")
+    assert response.status_code == 400, "expected 400 when no resume could be screened"
+    print("✅ Test 6 PASSED")
+except Exception as e:
+    print(f"❌ Test 6 FAILED: {e}")
+
+S.close()
+
 print("\n" + "="*50)
 print("🎉 Testing Complete!")
 print("="*50)
@@ -0,0 +1,76 @@
+"""
+Tests for the single-pass text normalizers, checked against the
+multi-pass implementations they replaced.
+"""
+
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from screener.nlp import preprocess_text
+from screener.parsing import clean_text, normalize_text
+
+# Pieces that exercise every branch: whitespace kinds, URLs, emails,
+# punctuation, hyphens/dots and non-ASCII word characters. Characters whose
+# lowercase form adds a combining mark (e.g. "İ") are left out: cleaning
+# before lowercasing keeps that mark and normalize_text drops it.
+PIECES = [
+    "python", "Senior", "ENGINEER", "c++", "node.js", "e-mail", "x", "42",
+    " ", "  ", "\t", "\n", "\r\n", " ",
+    "http://example.com/a?b=1", "https://x.io", "www.site.org", "httpfoo", "wwwbar",
+    "jane@doe.com", "a@b", "@", "me@http://x.com", "@www.x", "mail:me@x.org,",
+    ".", "-", "_", ",", ";", "(", ")", "/", "#", "!", "•", "café", "Straße", "日本"
+]
+
+
+def _reference_preprocess_text(text: str) -> str:
+    """preprocess_text before it was fused into one regex pass."""
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def _reference_clean_text(text: str) -> str:
+    """clean_text with uncompiled patterns, as it was first written."""
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    text = re.sub(r'[^\w\s\-\.]', ' ', text)
+    return text
+
+
+def random_text(rng: random.Random) -> str:
+    """Random concatenation of PIECES, with or without separators."""
+    sep = rng.choice(["", " "])
+    return sep.join(rng.choice(PIECES) for _ in range(rng.randint(0, 30)))
+
+
+def test_preprocess_text_matches_reference():
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = random_text(rng)
+        assert preprocess_text(text) == _reference_preprocess_text(text), text
+
+
+def test_clean_text_matches_reference():
+    rng = random.Random(1)
+    for _ in range(2000):
+        text = random_text(rng)
+        assert clean_text(text) == _reference_clean_text(text), text
+
+
+def test_normalize_text_matches_two_step_pipeline():
+    rng = random.Random(2)
+    for _ in range(5000):
+        text = random_text(rng)
+        assert normalize_text(text) == _reference_preprocess_text(_reference_clean_text(text)), text
+
+
+@pytest.mark.parametrize("name", ["test_resume.txt", "test_jd.txt"])
+def test_normalize_text_matches_on_sample_files(name):
+    text = (Path(__file__).parent.parent / name).read_text(encoding="utf-8")
+    assert normalize_text(text) == _reference_preprocess_text(_reference_clean_text(text))
+
@@ -0,0 +1,226 @@
+"""
+Tests for the scoring kernels: skill bitsets, sparse row similarity and
+the batch scoring paths, each checked against a straightforward reference.
+"""
+
+import random
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+from screener.scoring import (
+    HASH_FEATURES, MERGE_DOT_MAX_NNZ, JDContext, ResumeMatcher,
+    _bit_positions, _encode_bits, _popcount, _row_dot
+)
+
+# Synthetic taxonomy: 243 skills (not a multiple of 64) in 6 categories
+SKILLS = [f"skill{i:03d}" for i in range(243)]
+SKILL_INDEX = {skill: i for i, skill in enumerate(SKILLS)}
+CATEGORIES = ["languages", "frameworks", "databases", "cloud", "tools", "soft"]
+
+WORDS = SKILLS[:40] + [
+    "python", "developer", "experience", "years", "team", "api", "design",
+    "machine", "learning", "data", "cloud", "docker", "senior", "lead",
+    "the", "and", "with", "of", "built", "services", "scalable", "sql"
+]
+
+
+@pytest.fixture(params=["bitwise_count", "unpackbits"])
+def popcount_impl(request, monkeypatch):
+    """Run a test with NumPy's native popcount and with the NumPy 1.x fallback."""
+    if request.param == "unpackbits":
+        monkeypatch.delattr(np, "bitwise_count", raising=False)
+    elif not hasattr(np, "bitwise_count"):
+        pytest.skip("NumPy < 2.0 has no bitwise_count")
+    return request.param
+
+
+def random_skills(rng: random.Random, max_skills: int = 40) -> dict:
+    """A SkillExtractor-style result with random skills from SKILLS."""
+    by_category = {}
+    for skill in rng.sample(SKILLS, rng.randint(0, max_skills)):
+        by_category.setdefault(CATEGORIES[SKILL_INDEX[skill] % len(CATEGORIES)], []).append(skill)
+    return {"by_category": by_category}
+
+
+def random_text(rng: random.Random, max_words: int = 400) -> str:
+    """Preprocessed-looking text of random words."""
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, max_words)))
+
+
+def random_row(rng: np.random.Generator, nnz: int, shared_with=None):
+    """
+    An L2-normalized float32 1 x HASH_FEATURES CSR row with sorted indices.
+    Half of its columns are taken from shared_with's, if given, so the
+    two rows overlap.
+    """
+    indices = rng.choice(HASH_FEATURES, size=nnz, replace=False)
+    if shared_with is not None:
+        shared = shared_with.indices[:min(nnz, shared_with.nnz) // 2]
+        indices = np.concatenate([shared, np.setdiff1d(indices, shared)[:nnz - len(shared)]])
+    indices = np.sort(indices)
+    data = rng.random(len(indices)).astype(np.float32) + np.float32(0.01)
+    if len(indices):
+        data /= np.linalg.norm(data)
+    return sp.csr_matrix((data, indices, [0, len(indices)]), shape=(1, HASH_FEATURES))
+
+
+@pytest.mark.parametrize("size", [1, 63, 64, 65, 130, 243])
+def test_encode_bits_sets_one_bit_per_skill(size):
+    rng = random.Random(size)
+    index = {skill: i for i, skill in enumerate(SKILLS[:size])}
+    for _ in range(50):
+        skills = rng.sample(list(index), rng.randint(0, size))
+        bits = _encode_bits(skills, index)
+
+        assert bits.dtype == np.uint64 and bits.shape == ((size + 63) // 64,)
+        assert _bit_positions(bits).tolist() == sorted(index[skill] for skill in skills)
+
+
+def test_popcount_matches_python(popcount_impl):
+    rng = np.random.default_rng(0)
+    words = rng.integers(0, 2 ** 64, size=(200, 4), dtype=np.uint64)
+    words[0] = 0
+    words[1] = np.iinfo(np.uint64).max
+
+    expected = [sum(bin(int(word)).count("1") for word in row) for row in words]
+
+    assert _popcount(words).tolist() == expected
+    assert _popcount(words[5]) == expected[5]
+
+
+def test_bit_positions_matches_python():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        bits = rng.integers(0, 2 ** 64, size=4, dtype=np.uint64)
+        # Sparse words too, including the top bit of a word
+        bits &= rng.integers(0, 2 ** 64, size=4, dtype=np.uint64)
+        bits[rng.integers(4)] |= np.uint64(1) << np.uint64(63)
+
+        expected = [64 * w + b for w, word in enumerate(bits.tolist()) for b in range(64) if word >> b & 1]
+
+        assert _bit_positions(bits).tolist() == expected
+
+
+@pytest.mark.parametrize("nnz_a, nnz_b", [
+    (0, 0), (0, 10), (1, 1), (5, 40), (60, 60), (64, 64), (30, 300), (400, 700)
+])
+def test_row_dot_matches_sparse_product(nnz_a, nnz_b):
+    rng = np.random.default_rng(nnz_a * 1000 + nnz_b)
+    for _ in range(20):
+        a = random_row(rng, nnz_a)
+        b = random_row(rng, nnz_b, shared_with=a)
+
+        expected = min(1.0, max(0.0, float(a.dot(b.T).toarray()[0, 0])))
+
+        assert _row_dot(a, b) == pytest.approx(expected, abs=1e-6)
+        assert _row_dot(b, a) == pytest.approx(expected, abs=1e-6)
+
+
+def test_row_dot_takes_both_paths_and_clamps():
+    rng = np.random.default_rng(2)
+    short = random_row(rng, MERGE_DOT_MAX_NNZ // 2)
+    long = random_row(rng, MERGE_DOT_MAX_NNZ * 2)
+
+    # A row against itself is 1 (not 1 + rounding) on either path
+    assert _row_dot(short, short) == pytest.approx(1.0, abs=1e-6) and _row_dot(short, short) <= 1.0
+    assert _row_dot(long, long) == pytest.approx(1.0, abs=1e-6) and _row_dot(long, long) <= 1.0
+
+
+@pytest.mark.parametrize("fitted", [False, True])
+def test_similarity_matches_float64_pipeline(fitted):
+    rng = random.Random(3)
+    corpus = [random_text(rng) for _ in range(30)]
+    texts = [random_text(rng) for _ in range(40)]
+
+    matcher = ResumeMatcher()
+    vectorizer = HashingVectorizer(n_features=HASH_FEATURES, alternate_sign=False, lowercase=True,
+                                   stop_words='english', ngram_range=(1, 2), norm='l2')
+    transformer = None
+    if fitted:
+        matcher.fit_corpus(corpus)
+        transformer = TfidfTransformer().fit(vectorizer.transform(corpus))
+
+    def row64(text):
+        row = vectorizer.transform([text])
+        return transformer.transform(row) if transformer is not None else row
+
+    jd = random_text(rng, 200)
+    for text in texts:
+        expected = float(row64(text).dot(row64(jd).T).toarray()[0, 0]) if text.strip() and jd.strip() else 0.0
+
+        assert matcher.calculate_similarity_score(text, jd) == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("skill_index", [None, SKILL_INDEX])
+def test_score_resumes_batch_matches_pairwise(popcount_impl, skill_index):
+    rng = random.Random(4)
+    matcher = ResumeMatcher(skill_index=skill_index)
+    for _ in range(100):
+        jd_skills = random_skills(rng)
+        resumes = [random_skills(rng) for _ in range(rng.randint(1, 6))]
+
+        expected = [matcher.calculate_skill_match_score(resume, jd_skills) for resume in resumes]
+
+        assert matcher.score_resumes_batch(resumes, jd_skills) == expected
+
+
+def test_score_resumes_batch_outside_index_and_empty():
+    matcher = ResumeMatcher(skill_index={"python": 0, "sql": 1})
+    jd_skills = {"by_category": {"languages": ["python", "rust"]}}
+    resumes = [{"by_category": {"languages": ["rust", "go"]}}, {}]
+
+    assert matcher.score_resumes_batch(resumes, jd_skills) == [
+        matcher.calculate_skill_match_score(resume, jd_skills) for resume in resumes
+    ]
+    assert matcher.score_resumes_batch([], jd_skills) == []
+    assert matcher.score_resumes_batch(resumes, {}) == [
+        (1.0, {"matched": [], "missing": [], "required": 0})
+    ] * 2
+
+
+@pytest.mark.parametrize("weights", [None, {"similarity": 0.3, "skills": 0.7}])
+def test_score_batch_matches_scalar(weights):
+    rng = np.random.default_rng(5)
+    similarities = np.concatenate([rng.random(200), [0.0, 1.0, 0.4, 0.8, 0.0]])
+    skill_matches = np.concatenate([rng.random(200), [0.0, 1.0, 0.0, 0.0, 0.4]])
+
+    matcher = ResumeMatcher()
+    composite, ratings = matcher.score_batch(similarities, skill_matches, weights)
+
+    for i in range(len(similarities)):
+        expected = matcher.generate_composite_score(float(similarities[i]), float(skill_matches[i]), weights)
+        assert composite[i] == expected
+        assert ratings[i] == matcher._score_to_rating(expected)
+
+
+@pytest.mark.parametrize("skill_index", [None, SKILL_INDEX])
+def test_score_many_against_matches_pairwise_pipeline(popcount_impl, skill_index):
+    rng = random.Random(6)
+    matcher = ResumeMatcher(skill_index=skill_index)
+    matcher.fit_corpus([random_text(rng) for _ in range(25)])
+
+    for _ in range(10):
+        jd_text, jd_skills = random_text(rng, 200), random_skills(rng)
+        resumes = [(random_text(rng, 2000), random_skills(rng)) for _ in range(rng.randint(1, 8))]
+
+        results = matcher.score_many_against([text for text, _ in resumes], [skills for _, skills in resumes],
+                                             JDContext(jd_text, jd_skills, matcher))
+
+        for (text, skills), result in zip(resumes, results):
+            similarity = matcher.calculate_similarity_score(text, jd_text)
+            skill_match, details = matcher.calculate_skill_match_score(skills, jd_skills)
+            composite = matcher.generate_composite_score(similarity, skill_match)
+
+            assert result == {
+                "final_score": round(composite, 2),
+                "similarity_score": round(similarity * 100, 2),
+                "skill_match_score": round(skill_match * 100, 2),
+                "skill_details": details,
+                "feedback": matcher.generate_feedback(text, jd_text, details, composite),
+                "rating": matcher._score_to_rating(composite)
+            }
+
+    assert matcher.score_many_against([], [], JDContext("", {}, matcher)) == []